@@ -1,6 +1,9 @@
+import threading
+
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from scipy.linalg import eigh_tridiagonal, eigvalsh_tridiagonal
 
 # --- PAGE CONFIGURATION ---
 # Sets the browser tab title and layout
@@ -40,20 +43,35 @@ st.sidebar.info(
 )
 
 # --- PHYSICS ENGINE ---
+# Results are memoized on (N, v, w) so reruns triggered by unrelated widgets
+# (expanders, repeated slider values) skip the eigensolve.
+@st.cache_data(max_entries=64)
 def get_hamiltonian(N, v, w):
-    """Generates the SSH Hamiltonian matrix."""
+    """Generates the SSH Hamiltonian in tridiagonal form (diagonal, off-diagonal)."""
     dim = 2 * N
-    H = np.zeros((dim, dim))
-    for i in range(dim - 1):
-        if i % 2 == 0:
-            H[i, i+1] = v; H[i+1, i] = v # Intracell (A-B)
-        else:
-            H[i, i+1] = w; H[i+1, i] = w # Intercell (B-A)
-    return H
+    # Double precision is needed to resolve the exponentially small splitting of
+    # the two edge modes; otherwise their eigenvectors come out as arbitrary
+    # left/right mixtures instead of the symmetric/antisymmetric pair
+    diag = np.zeros(dim)
+    off_diag = np.empty(dim - 1)
+    off_diag[0::2] = v # Intracell (A-B)
+    off_diag[1::2] = w # Intercell (B-A)
+    return diag, off_diag
+
+@st.cache_data(max_entries=64)
+def solve_ssh(N, v, w):
+    """Returns the eigenvalues of the SSH Hamiltonian (no eigenvectors)."""
+    return eigvalsh_tridiagonal(*get_hamiltonian(N, v, w))
+
+@st.cache_data(max_entries=64)
+def solve_ssh_states(N, v, w, lo, hi):
+    """Returns only the eigenpairs with (ascending) indices lo..hi of the SSH Hamiltonian."""
+    return eigh_tridiagonal(*get_hamiltonian(N, v, w), select='i', select_range=(lo, hi))
 
 # Perform Calculation
-H = get_hamiltonian(N, v, w)
-eigenvalues, eigenvectors = np.linalg.eigh(H)
+# Only the spectrum is needed for the band plot; eigenvectors are computed
+# on demand for the few states shown in the localization panel.
+eigenvalues = solve_ssh(N, v, w)
 
 # Identify Zero Modes (Smallest absolute energy)
 # We sort by absolute energy to find the modes closest to E=0
@@ -61,29 +79,58 @@ sort_indices = np.argsort(np.abs(eigenvalues))
 zero_modes_indices = sort_indices[:2] # Top 2 closest to zero
 energy_gap = 2 * np.abs(eigenvalues[sort_indices[2]]) # Approx gap to next state
 
+# --- FIGURES ---
+# Figures are built once per server process and only their artists' data is
+# updated on each rerun, instead of creating and styling new figures every time.
+# Cached resources are shared by all sessions, so each figure comes with a lock
+# held while it is updated and rendered.
+@st.cache_resource
+def make_spectrum_figure():
+    """Creates the band structure figure: (fig, ax, bulk_line, edge_line, lock)."""
+    fig = Figure(figsize=(6, 4))
+    ax = fig.subplots()
+    bulk_line, = ax.plot([], [], 'o-', color='navy', markersize=4, linewidth=0.8, label='Bulk States')
+    edge_line, = ax.plot([], [], 'ro', markersize=6, label='Edge Modes')
+    ax.axhline(0, color='gray', linestyle='--', linewidth=0.8, alpha=0.5)
+    ax.set_ylabel(r"Energy ($E/v$)")
+    ax.set_xlabel("State Index")
+    ax.grid(True, alpha=0.2)
+    return fig, ax, bulk_line, edge_line, threading.Lock()
+
+@st.cache_resource
+def make_density_figure():
+    """Creates the localization figure: (fig, ax, mode_lines, bulk_line, lock)."""
+    fig = Figure(figsize=(6, 4))
+    ax = fig.subplots()
+    mode_lines = ax.plot([], np.empty((0, 2)), '.-') # One line per zero mode
+    bulk_line, = ax.plot([], [], 'g.-', label="Bulk State", alpha=0.6)
+    ax.set_xlabel("Lattice Site")
+    ax.grid(True, alpha=0.2)
+    return fig, ax, mode_lines, bulk_line, threading.Lock()
+
 # --- DASHBOARD LAYOUT ---
 col1, col2 = st.columns([1, 1])
 
 # --- PANEL 1: ENERGY SPECTRUM ---
 with col1:
     st.subheader("1. Energy Spectrum")
-    fig1, ax1 = plt.subplots(figsize=(6, 4))
-    
-    # Plot eigenvalues
-    sites = np.arange(2*N)
-    ax1.plot(sites, eigenvalues, 'o-', color='navy', markersize=4, linewidth=0.8, label='Bulk States')
+    fig1, ax1, bulk_line, edge_line, fig1_lock = make_spectrum_figure()
     
-    # Highlight Zero Mode Energies
-    if w > v:
-        ax1.plot(sites[:2], eigenvalues[zero_modes_indices], 'ro', markersize=6, label='Edge Modes')
-    
-    ax1.axhline(0, color='gray', linestyle='--', linewidth=0.8, alpha=0.5)
-    ax1.set_ylabel(r"Energy ($E/v$)")
-    ax1.set_xlabel("State Index")
-    ax1.set_title(f"Band Structure (Gap $\Delta \\approx {energy_gap:.2f}v$)")
-    ax1.legend(loc='upper left', fontsize=8)
-    ax1.grid(True, alpha=0.2)
-    st.pyplot(fig1)
+    with fig1_lock:
+        # Plot eigenvalues
+        sites = np.arange(2*N)
+        bulk_line.set_data(sites, eigenvalues)
+        
+        # Highlight Zero Mode Energies
+        edge_line.set_data(sites[:2], eigenvalues[zero_modes_indices])
+        edge_line.set_visible(w > v)
+        
+        ax1.set_title(f"Band Structure (Gap $\Delta \\approx {energy_gap:.2f}v$)")
+        ax1.legend(handles=[line for line in (bulk_line, edge_line) if line.get_visible()],
+                   loc='upper left', fontsize=8)
+        ax1.relim(visible_only=True)
+        ax1.autoscale_view()
+        st.pyplot(fig1)
 
     # Status Indicator
     if w > v:
@@ -97,32 +144,45 @@ with col1:
 with col2:
     st.subheader("2. Edge State Localization")
     
-    fig2, ax2 = plt.subplots(figsize=(6, 4))
+    fig2, ax2, mode_lines, bulk_state_line, fig2_lock = make_density_figure()
     
     if w > v:
         # Plot probability density |psi|^2 for the two zero modes
-        for idx in zero_modes_indices:
-            psi = eigenvectors[:, idx]
-            prob_density = np.abs(psi)**2
-            ax2.plot(np.arange(2*N), prob_density, '.-', label=f"E = {eigenvalues[idx]:.4f}")
+        # Chiral symmetry pins them to the middle of the ordered spectrum
+        mode_energies, mode_vectors = solve_ssh_states(N, v, w, N - 1, N)
+        prob_density = np.square(mode_vectors) # (2N, 2), psi is real: H is real symmetric
+        with fig2_lock:
+            for line, energy, density in zip(mode_lines, mode_energies, prob_density.T):
+                line.set_data(np.arange(2*N), density)
+                line.set_label(f"E = {energy:.4f}")
+                line.set_visible(True)
+            bulk_state_line.set_visible(False)
             
-        ax2.set_title(r"Wavefunction Probability Density $|\psi|^2$")
-        ax2.set_xlabel("Lattice Site")
-        ax2.legend()
-        ax2.grid(True, alpha=0.2)
-        st.pyplot(fig2)
+            ax2.set_title(r"Wavefunction Probability Density $|\psi|^2$")
+            ax2.legend(handles=mode_lines)
+            ax2.relim(visible_only=True)
+            ax2.autoscale(enable=True)
+            st.pyplot(fig2)
         st.caption("Notice the peaks at sites 0 and 2N. The electron is localized at the edges.")
         
     else:
         # In trivial phase, just plot a bulk state to show it's delocalized
         mid_state_idx = sort_indices[N] # Pick a state in the middle of the band
-        psi = eigenvectors[:, mid_state_idx]
-        ax2.plot(np.arange(2*N), np.abs(psi)**2, 'g.-', label="Bulk State", alpha=0.6)
-        ax2.set_title("Bulk State Density (Delocalized)")
-        ax2.set_xlabel("Lattice Site")
-        ax2.set_ylim(0, 0.5) # Fix scale to avoid jumping
-        ax2.grid(True, alpha=0.2)
-        st.pyplot(fig2)
+        _, mid_vectors = solve_ssh_states(N, v, w, mid_state_idx, mid_state_idx)
+        psi = mid_vectors[:, 0]
+        with fig2_lock:
+            for line in mode_lines:
+                line.set_visible(False)
+            bulk_state_line.set_data(np.arange(2*N), np.square(psi))
+            bulk_state_line.set_visible(True)
+            
+            ax2.set_title("Bulk State Density (Delocalized)")
+            if ax2.get_legend() is not None:
+                ax2.get_legend().remove()
+            ax2.relim(visible_only=True)
+            ax2.autoscale(enable=True, axis='x')
+            ax2.set_ylim(0, 0.5) # Fix scale to avoid jumping
+            st.pyplot(fig2)
         st.caption("In the trivial phase, electrons are spread across the chain.")
 
 # --- EXPANDER: THEORETICAL BACKGROUND ---
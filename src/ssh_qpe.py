@@ -4,15 +4,73 @@ Author: Ayush Kumar
 Method: Jordan-Wigner + Trotterization + QPE (8 Evaluation Qubits)
 """
 
+import os
 import numpy as np
-from qiskit import QuantumCircuit, transpile
-from qiskit.circuit.library import PauliEvolutionGate, PhaseEstimation
-from qiskit.synthesis import LieTrotter
+from scipy.sparse.linalg import eigsh
+from qiskit import ClassicalRegister, QuantumCircuit, QuantumRegister, transpile
+from qiskit.circuit import Parameter
+from qiskit.circuit.library import PauliEvolutionGate, PermutationGate, QFTGate
 from qiskit_aer import AerSimulator
 
 # Import the general Hamiltonian builder from your other file
 # Make sure ssh_quantum.py is in the same folder (src/)
-from ssh_quantum import build_qubit_hamiltonian
+from ssh_quantum import build_qubit_hamiltonian, build_sparse_matrix, many_body_spectrum
+
+def build_qpe_template(N, num_eval_qubits, trotter_steps, time):
+    """
+    Builds the QPE circuit with symbolic hoppings v and w, so it can be
+    transpiled once and then bound to any number of (v, w) points.
+    
+    PauliEvolutionGate does not accept Parameter coefficients, so the hopping
+    enters through the evolution time of each bond instead:
+    exp(-i s H_bond dt) with H_bond = 0.5 * (XX + YY) and s = v or w.
+    Bonds are applied in the same order as LieTrotter(reps=trotter_steps)
+    applies the terms of build_qubit_hamiltonian(N, v, w).
+    
+    Args:
+        N (int): Number of unit cells (System qubits = 2*N)
+        num_eval_qubits (int): Number of QPE evaluation qubits
+        trotter_steps (int): Lie-Trotter repetitions per controlled power
+        time (float): Evolution time t of U = exp(-iHt)
+        
+    Returns:
+        tuple: (QuantumCircuit with measurements, Parameter v, Parameter w)
+    """
+    v = Parameter("v")
+    w = Parameter("w")
+    num_sites = 2 * N
+    
+    # Unit-hopping operator: terms 2i and 2i+1 are the XX and YY parts of bond i
+    H_unit = build_qubit_hamiltonian(N, 1.0, 1.0)
+    bonds = [(H_unit[2*i:2*i + 2], v if i % 2 == 0 else w) for i in range(num_sites - 1)]
+    
+    def evolution(t):
+        # Trotterized exp(-iHt); XX and YY on the same bond commute, so each
+        # bond gate is exact and only the product over bonds is approximated
+        U = QuantumCircuit(num_sites, name="U")
+        dt = t / trotter_steps
+        for _ in range(trotter_steps):
+            for H_bond, strength in bonds:
+                U.append(PauliEvolutionGate(H_bond, time=strength * dt), range(num_sites))
+        return U
+    
+    # Standard QPE layout: Hadamards, controlled U^(2^j), inverse QFT
+    # (same construction as qiskit.circuit.library.phase_estimation)
+    eval_reg = QuantumRegister(num_eval_qubits, "eval")
+    system_reg = QuantumRegister(num_sites, "q")
+    qc = QuantumCircuit(eval_reg, system_reg, ClassicalRegister(num_eval_qubits, "c"))
+    
+    qc.h(eval_reg)
+    for j in range(num_eval_qubits):
+        # U^(2^j) is evolved for time 2^j * t, as PauliEvolutionGate.power does
+        controlled_power = evolution((2**j) * time).control()
+        qc.append(controlled_power, [eval_reg[j]] + system_reg[:])
+    qc.append(QFTGate(num_eval_qubits).inverse(), eval_reg[:])
+    qc.append(PermutationGate(list(reversed(range(num_eval_qubits)))), eval_reg[:])
+    
+    qc.measure(eval_reg, qc.clbits)
+    
+    return qc, v, w
 
 def run_precision_qpe():
     print("--- Starting High-Resolution QPE Simulation ---")
@@ -33,44 +91,52 @@ def run_precision_qpe():
     print(f"Physics: v={v}, w={w} (Topological Phase)")
     
     # --- 2. BUILD HAMILTONIAN & OPERATOR ---
-    H = build_qubit_hamiltonian(N, v, w)
-    
     # Calculate EXACT Classical Eigenvalues for comparison
+    # The full many-body spectrum is needed to match every QPE peak in the
+    # phase window |E| < pi/t; it is assembled from the single-particle levels
+    # of the chain, so the dense 2^(2N) x 2^(2N) matrix is never diagonalized
     print("\n[Reference] Calculating Classical Eigenvalues...")
-    matrix = H.to_matrix()
-    exact_evals = np.linalg.eigvalsh(matrix)
+    exact_evals = many_body_spectrum(N, v, w)
     
-    # We focus on the ones closest to zero (the edge states)
-    # Filter for energies between -2 and 2 to reduce clutter
-    print(f"True Energies (Target): {np.sort(exact_evals)[:4]}")
-
-    # Create Time Evolution Operator U = exp(-iHt)
-    synthesis = LieTrotter(reps=trotter_steps)
-    U_gate = PauliEvolutionGate(H, time=time, synthesis=synthesis)
+    # The printed ground-state levels come from the (memoized) sparse operator
+    # via ARPACK (Lanczos), which needs k < dim - 1; a 4x4 system (N=1) is
+    # small enough to read them off the full spectrum
+    matrix = build_sparse_matrix(N, v, w)
+    if 4 < matrix.shape[0] - 1:
+        lowest_evals = eigsh(matrix, k=4, which='SA', return_eigenvectors=False)
+    else:
+        lowest_evals = exact_evals[:4]
     
+    print(f"True Energies (Target): {np.sort(lowest_evals)}")
+
     # --- 3. BUILD CIRCUIT ---
     # Total Qubits = [Evaluation] + [System]
-    # QPE automatically handles the layout
-    # Use the correctly defined num_eval_qubits variable
-    qpe = PhaseEstimation(num_eval_qubits, U_gate)
-    
-    # The circuit needs (Eval + System) qubits
-    qc = QuantumCircuit(qpe.num_qubits, num_eval_qubits)
-    
+    # The circuit is built and transpiled once with symbolic v, w;
+    # scanning parameters only needs a cheap assign_parameters per point.
     # Initialization:
     # We leave system in |0000>. 
     # Ideally, we would prepare a specific state, but |0000> has overlap 
     # with multiple eigenstates, so we will see multiple peaks in the spectrum.
-    
-    qc.append(qpe, range(qpe.num_qubits))
-    qc.measure(range(num_eval_qubits), range(num_eval_qubits))
+    qc, v_param, w_param = build_qpe_template(N, num_eval_qubits, trotter_steps, time)
     
     # --- 4. RUN SIMULATION ---
     print("\nRunning Quantum Simulation (Aer)...")
-    backend = AerSimulator()
+    # Plain statevector with gate fusion: 12 qubits fit easily in memory and
+    # fusing the 1q/2q gates of each Trotter step cuts the number of kernels
+    backend = AerSimulator(
+        method="statevector",
+        max_parallel_threads=os.cpu_count(),
+        fusion_enable=True,
+        fusion_max_qubit=5,
+    )
     # Transpile the circuit to a form that Aer supports, avoiding unsupported instructions
-    qc_transpiled = transpile(qc, backend=backend)
-    job = backend.run(qc_transpiled, shots=4096)  # High shots for clean peaks
+    # (Aer has no coupling map, so no routing runs). Level 1 instead of the default
+    # level 2: the template is transpiled only once anyway, but level 2's extra
+    # resynthesis passes take ~3x longer for a circuit of about the same size.
+    qc_transpiled = transpile(qc, backend=backend, optimization_level=1)
+    # strict=False: a single unit cell (N=1) has no intercell bond, hence no w
+    qc_bound = qc_transpiled.assign_parameters({v_param: v, w_param: w}, strict=False)
+    job = backend.run(qc_bound, shots=4096)  # High shots for clean peaks
     counts = job.result().get_counts()
     
     # --- 5. ANALYZE RESULTS ---
@@ -103,7 +169,10 @@ def run_precision_qpe():
         energy_est = measured_phase * (2 * np.pi) / time
         
         # 4. Find nearest true eigenvalue to check accuracy
-        nearest_true = min(exact_evals, key=lambda x: abs(x - energy_est))
+        # many_body_spectrum is sorted, so it is one of the two neighbours of the insertion point
+        i = np.searchsorted(exact_evals, energy_est)
+        neighbours = exact_evals[max(i - 1, 0):i + 1]
+        nearest_true = neighbours[np.argmin(np.abs(neighbours - energy_est))]
         error = abs(energy_est - nearest_true)
         
         print(f"{bitstring:<10} | {probability:.3f}  | {measured_phase:.4f}   | {energy_est:.4f}       | {error:.4f}")
@@ -63,7 +63,14 @@ def run_noisy_simulation():
     noise_model.add_all_qubit_quantum_error(error_gate2, ["cx"])
     
     # --- 4. RUN SIMULATION ---
-    backend = AerSimulator()
+    # Depolarizing errors are Pauli mixtures, so they can be sampled per shot
+    # on a statevector instead of evolving the full density matrix
+    backend = AerSimulator(
+        method="statevector",
+        max_parallel_threads=os.cpu_count(),
+        fusion_enable=True,
+        fusion_max_qubit=5,
+    )
     qc_transpiled = transpile(qc, backend=backend)
     
     # Run Noisy
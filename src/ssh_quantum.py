@@ -4,12 +4,18 @@ Author: Ayush Kumar
 Method: Jordan-Wigner Mapping + SparsePauliOp
 """
 
+from functools import lru_cache
+
 import numpy as np
-from qiskit.quantum_info import SparsePauliOp
+from qiskit.quantum_info import PauliList, SparsePauliOp
+from scipy.linalg import eigvalsh_tridiagonal
 
+@lru_cache(maxsize=64)
 def build_qubit_hamiltonian(N, v, w):
     """
     Maps the SSH Fermi-Hubbard Hamiltonian to Qubit Operators using Jordan-Wigner.
+    Results are memoized on (N, v, w): the returned operator is shared between
+    calls and must not be modified in place.
     
     Args:
         N (int): Number of unit cells (Total sites = 2*N)
@@ -20,33 +26,61 @@ def build_qubit_hamiltonian(N, v, w):
         SparsePauliOp: The Hamiltonian expressed as Pauli strings (Sum of X and Y terms).
     """
     num_sites = 2 * N
-    terms = []
+    num_bonds = num_sites - 1
     
-    # We iterate through bonds to create hopping terms
+    # Every bond (i, i+1) carries a hopping term
     # Hopping term c^dag_i c_{i+1} + h.c. becomes 0.5 * (X_i X_{i+1} + Y_i Y_{i+1})
+    # Instead of appending terms one by one, every term is laid out at once as
+    # rows of the symplectic (Z, X) bit tables: row 2i is X_i X_{i+1}, row 2i+1 is Y_i Y_{i+1}.
     
-    for i in range(num_sites - 1):
-        # Determine hopping strength (v or w)
-        strength = v if (i % 2 == 0) else w
-        
-        # Construct Pauli String "II...XX...II" and "II...YY...II"
-        # Note: Qiskit reads qubits from right to left (Little Endian). 
-        # But SparsePauliOp.from_sparse_list is easier to use for indexing.
-        
-        # X_i X_{i+1} term
-        # Each entry in the sparse list is (pauli_string, [qubit_indices], coefficient)
-        terms.append(("XX", [i, i+1], strength / 2.0))
-        
-        # Y_i Y_{i+1} term
-        terms.append(("YY", [i, i+1], strength / 2.0))
+    # Determine hopping strength (v or w) of every bond
+    strength = np.where(np.arange(num_bonds) % 2 == 0, v, w)
+    
+    # Both Paulis of a term act on qubits [i, i+1] (column index = qubit index)
+    bond = np.repeat(np.arange(num_bonds), 2)
+    rows = np.arange(2 * num_bonds)
+    x_bits = np.zeros((2 * num_bonds, num_sites), dtype=bool)
+    x_bits[rows, bond] = True
+    x_bits[rows, bond + 1] = True
+    
+    # X has only the X bit set, Y has both the X and Z bits set
+    z_bits = np.zeros_like(x_bits)
+    z_bits[1::2] = x_bits[1::2]
     
     # Create the Operator
-    # Qiskit signature (as used here): from_sparse_list(pauli_list, num_qubits)
-    # where each element of pauli_list is (label, qubit_indices, coeff).
-    H_qubit = SparsePauliOp.from_sparse_list(terms, num_sites)
+    # Each bond contributes strength / 2 to both its XX and YY term.
+    paulis = PauliList.from_symplectic(z_bits, x_bits)
+    H_qubit = SparsePauliOp(paulis, np.repeat(strength / 2.0, 2))
     
     return H_qubit
 
+@lru_cache(maxsize=64)
+def build_sparse_matrix(N, v, w):
+    """
+    Sparse (CSR) matrix of build_qubit_hamiltonian(N, v, w), for exact
+    diagonalization with scipy.sparse.linalg. Memoized like the operator,
+    so it is shared between calls and must not be modified in place.
+    """
+    return build_qubit_hamiltonian(N, v, w).to_matrix(sparse=True)
+
+def many_body_spectrum(N, v, w):
+    """
+    All 2^(2N) eigenvalues of build_qubit_hamiltonian(N, v, w), sorted.
+    
+    Under Jordan-Wigner the XX + YY chain is a free-fermion hopping model,
+    so every many-body level is a sum of occupied single-particle energies.
+    Those come from the 2N x 2N tridiagonal hopping matrix, which avoids
+    diagonalizing the 2^(2N) x 2^(2N) qubit operator.
+    """
+    num_sites = 2 * N
+    off_diag = np.where(np.arange(num_sites - 1) % 2 == 0, v, w).astype(float)
+    single_particle = eigvalsh_tridiagonal(np.zeros(num_sites), off_diag)
+    
+    # Row b of the occupation table is basis state b: bit k set = mode k occupied
+    occupations = (np.arange(2**num_sites)[:, None] >> np.arange(num_sites)) & 1
+    
+    return np.sort(occupations @ single_particle)
+
 if __name__ == "__main__":
     # --- TEST 1: Sanity Check ---
     print("Building Hamiltonian for N=2 (4 Qubits)...")
@@ -60,9 +94,10 @@ if __name__ == "__main__":
     # using exact matrix math (not a quantum simulation yet).
     from qiskit.quantum_info import Statevector
     
-    # Convert operator to matrix and find eigenvalues
-    matrix = H.to_matrix()
-    evals = np.linalg.eigvalsh(matrix)
+    # Convert operator to a sparse matrix and find the lowest eigenvalues (Lanczos)
+    from scipy.sparse.linalg import eigsh
+    matrix = build_sparse_matrix(N=2, v=1.0, w=0.5)
+    evals = eigsh(matrix, k=4, which='SA', return_eigenvectors=False)
     
     print("\nTarget Eigenvalues (Lowest 4):")
-    print(np.sort(evals)[:4])
\ No newline at end of file
+    print(np.sort(evals))
\ No newline at end of file
@@ -8,33 +8,88 @@ to observe the topological phase transition and zero-energy edge modes.
 
 import numpy as np
 import matplotlib.pyplot as plt
+from scipy.linalg import eigvalsh_tridiagonal
+
+# Optional GPU backend for the parameter sweep
+try:
+    import cupy as cp
+except ImportError:
+    cp = None
 
 def get_hamiltonian(N, v, w):
     """
-    Constructs the SSH Hamiltonian for a chain with N unit cells (2N sites).
+    Constructs the SSH Hamiltonian for a chain with N unit cells (2N sites)
+    in tridiagonal form, as expected by scipy.linalg.eigh_tridiagonal.
+    Returns (diagonal, off_diagonal); the diagonal is zero (no on-site energy).
     v: intra-cell hopping (A-B)
     w: inter-cell hopping (B-A)
     """
     dim = 2 * N
-    H = np.zeros((dim, dim))
+    diag = np.zeros(dim)
+    off_diag = np.empty(dim - 1)
     
-    # Constructing the matrix elements
     # logic: site i connects to i+1 with alternating strengths v and w
-    for i in range(dim - 1):
-        if i % 2 == 0:
-            # Inside the unit cell (A -> B)
-            H[i, i+1] = v
-            H[i+1, i] = v
-        else:
-            # Between unit cells (B -> A of next cell)
-            H[i, i+1] = w
-            H[i+1, i] = w
+    # Inside the unit cell (A -> B): even i
+    off_diag[0::2] = v
+    # Between unit cells (B -> A of next cell): odd i
+    off_diag[1::2] = w
             
-    return H
+    return diag, off_diag
+
+def simulate_phase_transition(N, v, w_range):
+    """
+    Diagonalizes the SSH Hamiltonian for every inter-cell hopping in w_range.
+    Returns an array of shape (len(w_range), 2N) with the sorted eigenvalues.
+    """
+    # The chain is tridiagonal, so every point is solved with LAPACK's
+    # tridiagonal eigensolver (O(n^2) time, O(n) memory) instead of a
+    # dense O(n^3) eigh. Only the inter-cell (w) hoppings change along
+    # the sweep, so they are updated in place.
+    diag, off_diag = get_hamiltonian(N, v, 0.0)
+    
+    # Results are written straight into one preallocated array
+    eigenvalues = np.empty((len(w_range), 2 * N), dtype=diag.dtype)
+    
+    for k, w in enumerate(w_range):
+        off_diag[1::2] = w
+            
+        # Diagonalize (eigenvalues only; the bands are built here from finite
+        # floats, so SciPy's per-call NaN/inf scan is skipped)
+        eigenvalues[k] = eigvalsh_tridiagonal(diag, off_diag, check_finite=False)
+        
+    return eigenvalues
+
+def gpu_available():
+    # CuPy can be installed on machines without a usable CUDA device
+    if cp is None:
+        return False
+    try:
+        return cp.cuda.runtime.getDeviceCount() > 0
+    except cp.cuda.runtime.CUDARuntimeError:
+        return False
 
-def check_hermiticity(H):
-    # Sanity check: Hamiltonian must be Hermitian for real eigenvalues
-    return np.allclose(H, H.T.conj())
+def simulate_phase_transition_gpu(N, v, w_range):
+    """
+    GPU version of simulate_phase_transition (requires CuPy).
+    Chiral symmetry: in the sublattice (A, B) basis H = [[0, M], [M^T, 0]], where
+    M is the N x N lower-bidiagonal hopping block (v on the diagonal, w below it),
+    so the spectrum is +/- the singular values of M. The sweep is a batch of
+    independent small problems, so all M are stacked into one
+    (len(w_range), N, N) array and solved by a single batched cuSOLVER SVD,
+    on matrices of half the dimension of H.
+    """
+    w_range = cp.asarray(w_range)
+    
+    # M[n, n] = v (A_n <-> B_n), M[n+1, n] = w (B_n <-> A_{n+1})
+    cells = cp.arange(N)
+    M_stack = cp.zeros((len(w_range), N, N))
+    M_stack[:, cells, cells] = v
+    M_stack[:, cells[1:], cells[:-1]] = w_range[:, None]
+    
+    # Singular values come out in descending order
+    sv = cp.linalg.svd(M_stack, compute_uv=False)
+    
+    return cp.asnumpy(cp.concatenate([-sv, sv[:, ::-1]], axis=1))
 
 def main():
     # --- System Parameters ---
@@ -44,20 +99,11 @@ def main():
     
     print(f"Simulating SSH chain with {2*N} sites...")
     
-    eigenvalues = []
-    
-    for w in w_range:
-        H = get_hamiltonian(N, v, w)
-        
-        # Physics check
-        if not check_hermiticity(H):
-            raise ValueError("Error: Matrix is not Hermitian!")
-            
-        # Diagonalize
-        evals, _ = np.linalg.eigh(H)
-        eigenvalues.append(evals)
-        
-    eigenvalues = np.array(eigenvalues)
+    if gpu_available():
+        print("CUDA device found, diagonalizing on the GPU (CuPy)...")
+        eigenvalues = simulate_phase_transition_gpu(N, v, w_range)
+    else:
+        eigenvalues = simulate_phase_transition(N, v, w_range)
     
     # --- Plotting the Spectrum ---
     plt.figure(figsize=(10, 6))